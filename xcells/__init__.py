@@ -0,0 +1,3 @@
+from .core.diff import diff
+
+__all__ = ["diff"]
@@ -0,0 +1,272 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from .reader import Reader
+from .workbook import Workbook
+from .worksheet import Worksheet
+from .memory import strings_size
+from .logger_config import logger
+
+
+class _CacheEntry:
+    """
+    Cached state of a single workbook file.
+
+    Attributes:
+        signature (tuple): The (mtime, size) pair the entry was loaded from.
+        sheet_ids (list): The sheet ids of the workbook in workbook order.
+        shared_strings (list): The shared strings table of the workbook.
+        size (int): The approximate size of the shared strings table.
+    """
+
+    def __init__(self, signature: Tuple[int, int], sheet_ids: List[str],
+                 shared_strings: List[str]):
+        self.signature = signature
+        self.sheet_ids = sheet_ids
+        self.shared_strings = shared_strings
+        self.size = strings_size(shared_strings)
+
+
+class WorkbookCache:
+    """
+    An in-process cache of parsed workbooks with a memory budget.
+
+    Entries are keyed by the absolute path of the file and invalidated when
+    its modification time or size changes. A request always returns every
+    worksheet of the workbook. Worksheets are tracked and evicted
+    individually in least-recently-used order, so evicting part of a
+    workbook only costs parsing the evicted sheets again on its next
+    request. A workbook larger than the budget on its own is returned
+    without being stored.
+
+    Concurrent requests for the same file are deduplicated: the first caller
+    parses the file and the others receive its result.
+
+    Attributes:
+        max_bytes (int): The approximate memory budget of the cache.
+        hits (int): The number of requests served from the cache or from
+            the load of a concurrent request.
+        misses (int): The number of requests that had to parse the file.
+        evictions (int): The number of worksheets evicted from the cache.
+    """
+
+    def __init__(self, max_bytes: int, reader: Optional[Reader] = None):
+        """
+        Initialize a WorkbookCache object.
+
+        Args:
+            max_bytes (int): The approximate memory budget in bytes.
+            reader (Reader, optional): The reader used to parse files.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._reader = reader or Reader()
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._sheets: 'OrderedDict[Tuple[str, str], Tuple[Worksheet, int]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    @property
+    def size(self) -> int:
+        """The approximate number of bytes held by the cache."""
+        return self._size
+
+    def get(self, filename: str) -> Workbook:
+        """
+        Return the workbook stored in a file, parsing it if needed.
+
+        Args:
+            filename (str): The path to the Excel file.
+
+        Returns:
+            Workbook: The parsed workbook object.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            workbook = self._lookup(path, signature)
+            if workbook is not None:
+                self.hits += 1
+                return workbook
+
+            loading = self._in_flight.get(path)
+            if loading is None:
+                future = self._in_flight[path] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if loading is not None:
+            # Another thread is loading this file, share its result.
+            return loading.result()
+
+        try:
+            workbook = self._load(path, signature)
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(workbook)
+        finally:
+            with self._lock:
+                del self._in_flight[path]
+
+        return workbook
+
+    def invalidate(self, filename: str) -> None:
+        """
+        Drop a file and all of its worksheets from the cache.
+
+        Args:
+            filename (str): The path to the Excel file.
+        """
+        with self._lock:
+            self._drop(os.path.abspath(filename))
+
+    def clear(self) -> None:
+        """Drop every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._sheets.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": self._size,
+                "sheets": len(self._sheets),
+            }
+
+    def _lookup(self, path: str, signature: Tuple[int, int]) -> Optional[Workbook]:
+        """
+        Assemble a workbook from the cache if all of its sheets are present.
+        Must be called with the lock held.
+        """
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry.signature != signature:
+            logger.debug(f"Workbook {path} changed on disk, dropping cache entry")
+            self._drop(path)
+            return None
+
+        keys = [(path, sheet_id) for sheet_id in entry.sheet_ids]
+        if not all(key in self._sheets for key in keys):
+            return None
+
+        workbook = Workbook()
+        workbook.filename = path
+        workbook._shared_strings = entry.shared_strings
+        for key in keys:
+            self._sheets.move_to_end(key)
+            workbook.worksheets.append(self._sheets[key][0])
+        return workbook
+
+    def _load(self, path: str, signature: Tuple[int, int]) -> Workbook:
+        """
+        Parse the sheets of a file missing from the cache and store them.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature != signature:
+                self._drop(path)
+                entry = None
+            cached = {}
+            if entry is not None:
+                for sheet_id in entry.sheet_ids:
+                    item = self._sheets.get((path, sheet_id))
+                    if item is not None:
+                        cached[sheet_id] = item
+            missing = None if entry is None else [
+                sheet_id for sheet_id in entry.sheet_ids if sheet_id not in cached]
+
+        loaded = self._reader.read(path, sheet_ids=missing)
+        sizes = {sheet.sheet_id: sheet.memory_usage()["total"] for sheet in loaded.worksheets}
+
+        with self._lock:
+            if entry is None:
+                entry = _CacheEntry(
+                    signature,
+                    [sheet.sheet_id for sheet in loaded.worksheets],
+                    loaded._shared_strings)
+            if self._entries.get(path) is not entry:
+                # New file, or the entry was dropped while we were parsing.
+                self._drop(path)
+                self._entries[path] = entry
+                self._size += entry.size
+
+            sheets = {sheet_id: sheet for sheet_id, (sheet, _) in cached.items()}
+            for sheet in loaded.worksheets:
+                sheets[sheet.sheet_id] = sheet
+
+            workbook = Workbook()
+            workbook.filename = path
+            workbook._shared_strings = entry.shared_strings
+            workbook.worksheets = [sheets[sheet_id] for sheet_id in entry.sheet_ids]
+
+            total = entry.size + sum(sizes.values()) + sum(
+                size for _, size in cached.values())
+            if total > self.max_bytes:
+                # Storing it would evict every other entry and then itself.
+                logger.debug(f"Workbook {path} ({total} bytes) exceeds the cache budget, not storing it")
+                self._drop(path)
+                return workbook
+
+            for sheet in loaded.worksheets:
+                self._store(path, sheet, sizes[sheet.sheet_id])
+
+            self._evict()
+
+        return workbook
+
+    def _store(self, path: str, sheet: Worksheet, size: int) -> None:
+        """Add a worksheet to the cache. Must be called with the lock held."""
+        key = (path, sheet.sheet_id)
+        previous = self._sheets.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+
+        self._sheets[key] = (sheet, size)
+        self._size += size
+
+    def _evict(self) -> None:
+        """
+        Evict least-recently-used worksheets until the cache fits its budget.
+        Must be called with the lock held.
+        """
+        while self._size > self.max_bytes and self._sheets:
+            (path, sheet_id), (sheet, size) = self._sheets.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            logger.debug(f"Evicted worksheet {sheet.name} of {path} ({size} bytes)")
+
+            entry = self._entries[path]
+            if not any((path, other) in self._sheets for other in entry.sheet_ids):
+                del self._entries[path]
+                self._size -= entry.size
+
+    def _drop(self, path: str) -> None:
+        """Drop a file from the cache. Must be called with the lock held."""
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        self._size -= entry.size
+        for sheet_id in entry.sheet_ids:
+            item = self._sheets.pop((path, sheet_id), None)
+            if item is not None:
+                self._size -= item[1]
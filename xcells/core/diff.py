@@ -0,0 +1,331 @@
+import re
+import zipfile
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from lxml import etree
+from .reader import Reader
+from .logger_config import logger
+from .namespaces import NAMESPACES as ns
+
+_ROW_TAG = f"{{{ns['xl']}}}row"
+_CELL_TAG = f"{{{ns['xl']}}}c"
+_VALUE_TAG = f"{{{ns['xl']}}}v"
+_COLUMN = re.compile(r'^[A-Z]+')
+
+RowKey = Union[int, str, None]
+
+
+class SheetDiff:
+    """
+    A class to represent the differences between two versions of a worksheet.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the worksheet.
+    skipped : bool
+        True if the worksheet was skipped because it is unchanged.
+    added : list
+        The keys of the rows only present in the new worksheet.
+    removed : list
+        The keys of the rows only present in the old worksheet.
+    changed : dict
+        The changed cells of the rows present in both worksheets, mapping row
+        keys to {column: (old value, new value)} dictionaries.
+    duplicates : list
+        The keys shared by several rows of either worksheet. Such rows are
+        compared as a multiset: rows without an identical counterpart are
+        reported as added or removed, once per row.
+    """
+    def __init__(self, name: str, skipped: bool = False):
+        """
+        Initialize a SheetDiff object.
+
+        Parameters:
+        -----------
+        name : str
+            The name of the worksheet.
+        skipped : bool
+            True if the worksheet was skipped because it is unchanged.
+        """
+        self.name = name
+        self.skipped = skipped
+        self.added: List[RowKey] = []
+        self.removed: List[RowKey] = []
+        self.changed: Dict[RowKey, Dict[str, Tuple[Optional[str], Optional[str]]]] = {}
+        self.duplicates: List[RowKey] = []
+
+    @property
+    def has_changes(self) -> bool:
+        """True if any row was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the worksheet diff.
+
+        Returns:
+        --------
+        str
+            A string representation of the worksheet diff.
+        """
+        return (f"SheetDiff(name={self.name}, added={len(self.added)}, " +
+                f"removed={len(self.removed)}, changed={len(self.changed)})")
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class WorkbookDiff:
+    """
+    A class to represent the differences between two versions of a workbook.
+
+    Attributes:
+    -----------
+    sheets : dict
+        SheetDiff objects of the worksheets present in both workbooks.
+    added_sheets : list
+        The names of the worksheets only present in the new workbook.
+    removed_sheets : list
+        The names of the worksheets only present in the old workbook.
+    """
+    def __init__(self):
+        self.sheets: Dict[str, SheetDiff] = {}
+        self.added_sheets: List[str] = []
+        self.removed_sheets: List[str] = []
+
+    @property
+    def has_changes(self) -> bool:
+        """True if any worksheet was added, removed or changed."""
+        return bool(self.added_sheets or self.removed_sheets or
+                    any(sheet.has_changes for sheet in self.sheets.values()))
+
+
+def diff(old: str, new: str, key: Optional[str] = None) -> WorkbookDiff:
+    """
+    Compare two versions of a workbook.
+
+    Worksheets are matched by name and streamed row by row. Only a hash of
+    the raw values of every row is kept, so memory is bounded by the hash
+    tables rather than the sheet sizes; the rows whose hashes differ are
+    streamed a second time to report the changed cells. Worksheets whose
+    zip CRC and size match are skipped without hashing when the shared
+    strings they reference are the same in both workbooks.
+
+    Parameters:
+    -----------
+    old : str
+        The path to the old version of the workbook.
+    new : str
+        The path to the new version of the workbook.
+    key : Optional[str]
+        The column letter of the key used to align rows, e.g. "A". Rows are
+        aligned by row number if omitted. Rows with an empty key cell are
+        keyed by None. Rows sharing a key are listed in `duplicates` and only
+        reported as added or removed, never as changed. The letter is not
+        case-sensitive.
+
+    Returns:
+    --------
+    WorkbookDiff
+        The differences between the workbooks.
+
+    Raises:
+    -------
+    ValueError
+        If the key is not a column letter.
+    """
+    if key is not None:
+        key = key.upper()
+        if not _COLUMN.fullmatch(key):
+            raise ValueError(f"Key must be a column letter, got {key!r}")
+
+    result = WorkbookDiff()
+
+    with zipfile.ZipFile(old, 'r') as old_zip, zipfile.ZipFile(new, 'r') as new_zip:
+        old_sheets = _sheet_members(old_zip)
+        new_sheets = _sheet_members(new_zip)
+        old_strings = _shared_strings(old_zip)
+        new_strings = _shared_strings(new_zip)
+        same_strings = _same_member(old_zip, new_zip, 'xl/sharedStrings.xml')
+
+        result.removed_sheets = [name for name in old_sheets if name not in new_sheets]
+        result.added_sheets = [name for name in new_sheets if name not in old_sheets]
+
+        for name, old_member in old_sheets.items():
+            new_member = new_sheets.get(name)
+            if new_member is None:
+                continue
+
+            if _same_member(old_zip, new_zip, old_member, new_member) and (
+                    same_strings or _same_referenced_strings(
+                        old_zip, old_member, old_strings, new_strings)):
+                logger.debug(f"Worksheet {name} is unchanged, skipping it")
+                result.sheets[name] = SheetDiff(name, skipped=True)
+                continue
+
+            result.sheets[name] = _diff_sheet(
+                name, key,
+                (old_zip, old_member, old_strings),
+                (new_zip, new_member, new_strings))
+
+    return result
+
+
+def _diff_sheet(name: str, key: Optional[str], old: tuple, new: tuple) -> SheetDiff:
+    """
+    Compare two versions of a worksheet.
+    """
+    sheet_diff = SheetDiff(name)
+
+    old_hashes = _hash_rows(*old, key)
+    new_hashes = _hash_rows(*new, key)
+
+    changed = set()
+    row_keys = list(old_hashes) + [row_key for row_key in new_hashes if row_key not in old_hashes]
+    for row_key in row_keys:
+        old_list = old_hashes.get(row_key, [])
+        new_list = new_hashes.get(row_key, [])
+        if len(old_list) > 1 or len(new_list) > 1:
+            sheet_diff.duplicates.append(row_key)
+
+        if row_key is not None and len(old_list) == 1 and len(new_list) == 1:
+            if old_list[0] != new_list[0]:
+                changed.add(row_key)
+            continue
+
+        old_counts = Counter(old_list)
+        new_counts = Counter(new_list)
+        sheet_diff.removed.extend([row_key] * sum((old_counts - new_counts).values()))
+        sheet_diff.added.extend([row_key] * sum((new_counts - old_counts).values()))
+    del old_hashes, new_hashes
+
+    if not changed:
+        return sheet_diff
+
+    old_rows = _collect_rows(*old, key, changed)
+    new_rows = _collect_rows(*new, key, changed)
+    for row_key, new_values in new_rows.items():
+        old_values = old_rows.get(row_key, {})
+        cells = {}
+        for col in sorted(set(old_values) | set(new_values), key=lambda col: (len(col), col)):
+            if old_values.get(col) != new_values.get(col):
+                cells[col] = (old_values.get(col), new_values.get(col))
+        sheet_diff.changed[row_key] = cells
+
+    return sheet_diff
+
+
+def _hash_rows(zipf: zipfile.ZipFile, member: str, shared_strings: List[str],
+               key: Optional[str]) -> Dict[RowKey, List[int]]:
+    """
+    Hash the rows of a worksheet, grouping the hashes of rows sharing a key.
+    """
+    hashes: Dict[RowKey, List[int]] = {}
+    for row_key, values in _iter_rows(zipf, member, shared_strings, key):
+        hashes.setdefault(row_key, []).append(hash(tuple(sorted(values.items()))))
+    return hashes
+
+
+def _collect_rows(zipf: zipfile.ZipFile, member: str, shared_strings: List[str],
+                  key: Optional[str], keys: Set[RowKey]) -> Dict[RowKey, Dict[str, str]]:
+    """
+    Collect the values of the rows of a worksheet with the given keys.
+    """
+    return {row_key: values
+            for row_key, values in _iter_rows(zipf, member, shared_strings, key)
+            if row_key in keys}
+
+
+def _iter_rows(zipf: zipfile.ZipFile, member: str, shared_strings: List[str],
+               key: Optional[str]) -> Iterator[Tuple[RowKey, Dict[str, str]]]:
+    """
+    Stream the rows of a worksheet as (key, {column: raw value}) pairs.
+
+    Shared string indexes are resolved, since the same text usually has a
+    different index in two versions of a workbook. Cells without a value
+    are left out.
+    """
+    with zipf.open(member) as data:
+        for position, (_, row) in enumerate(
+                etree.iterparse(data, events=('end',), tag=_ROW_TAG), start=1):
+            values = {}
+            for col_position, cell in enumerate(row.iterfind(_CELL_TAG)):
+                value = cell.find(_VALUE_TAG)
+                cell_type = cell.get('t')
+                if cell_type == 'inlineStr':
+                    text = ''.join(cell.itertext())
+                elif value is None or value.text is None:
+                    continue
+                elif cell_type == 's':
+                    text = shared_strings[int(value.text)]
+                else:
+                    text = value.text
+
+                match = _COLUMN.match(cell.get('r') or '')
+                values[match.group() if match else str(col_position)] = text
+
+            row_number = row.get('r')
+            row_key = int(row_number) if row_number else position
+
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+
+            yield ((values.get(key) or None) if key else row_key), values
+
+
+def _sheet_members(zipf: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map the worksheet names of a workbook to their archive members.
+    """
+    sheets = Reader()._parse_workbook(zipf.read('xl/workbook.xml'))
+    return {sheet.name: f'xl/worksheets/sheet{sheet.sheet_id}.xml' for sheet in sheets}
+
+
+def _shared_strings(zipf: zipfile.ZipFile) -> List[str]:
+    """
+    Read the shared strings table of a workbook, which is optional.
+    """
+    try:
+        xml_data = zipf.read('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    return Reader()._extract_shared_strings(xml_data)
+
+
+def _same_referenced_strings(zipf: zipfile.ZipFile, member: str,
+                             old_strings: List[str], new_strings: List[str]) -> bool:
+    """
+    Check whether the shared strings referenced by a worksheet are the same
+    in two tables. The worksheet is streamed and the check stops at the
+    first difference.
+    """
+    with zipf.open(member) as data:
+        for _, row in etree.iterparse(data, events=('end',), tag=_ROW_TAG):
+            for cell in row.iterfind(_CELL_TAG):
+                value = cell.find(_VALUE_TAG)
+                if cell.get('t') != 's' or value is None or value.text is None:
+                    continue
+                string_id = int(value.text)
+                if (string_id >= len(old_strings) or string_id >= len(new_strings) or
+                        old_strings[string_id] != new_strings[string_id]):
+                    return False
+
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+    return True
+
+
+def _same_member(old_zip: zipfile.ZipFile, new_zip: zipfile.ZipFile,
+                 old_member: str, new_member: Optional[str] = None) -> bool:
+    """
+    Check whether two archive members have the same CRC and size.
+    """
+    try:
+        old_info = old_zip.getinfo(old_member)
+        new_info = new_zip.getinfo(new_member or old_member)
+    except KeyError:
+        return False
+    return old_info.CRC == new_info.CRC and old_info.file_size == new_info.file_size
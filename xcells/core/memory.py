@@ -0,0 +1,156 @@
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List
+from .cell import Cell, StringCell
+
+_INSTANCE_SIZES: Dict[type, int] = {}
+_VALUE_SIZES: Dict[type, int] = {}
+
+# Types whose instances all have the same size. The size of others, such
+# as int or Decimal, grows with the value and is measured every time.
+_FIXED_SIZE_TYPES = (float, bool, datetime, date, time, timedelta)
+
+_ASCII_STR_SIZE = sys.getsizeof('')
+_LATIN1_STR_SIZE = sys.getsizeof('\xe9') - 1
+_UCS2_STR_SIZE = sys.getsizeof('\u0100') - 2
+_UCS4_STR_SIZE = sys.getsizeof('\U0001f600') - 4
+
+
+def instance_size(obj: Any) -> int:
+    """
+    Return the size of an object and its attribute dictionary.
+
+    The size is measured once per class and reused, since instances of the
+    same class share the same layout.
+
+    Args:
+        obj (Any): The object.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    cls = type(obj)
+    size = _INSTANCE_SIZES.get(cls)
+    if size is None:
+        size = sys.getsizeof(obj) + sys.getsizeof(getattr(obj, '__dict__', {}))
+        _INSTANCE_SIZES[cls] = size
+    return size
+
+
+def str_size(value: str) -> int:
+    """
+    Compute the size of a string from its length and the width of its
+    widest character, as CPython stores it with 1, 2 or 4 bytes per
+    character.
+
+    Args:
+        value (str): The string.
+
+    Returns:
+        int: The size in bytes.
+    """
+    if value.isascii():
+        return _ASCII_STR_SIZE + len(value)
+    widest = max(map(ord, value))
+    if widest < 0x100:
+        return _LATIN1_STR_SIZE + len(value)
+    if widest < 0x10000:
+        return _UCS2_STR_SIZE + 2 * len(value)
+    return _UCS4_STR_SIZE + 4 * len(value)
+
+
+def value_size(value: Any) -> int:
+    """
+    Estimate the size of a cell value.
+
+    Strings are sized from their length, values of fixed-size types are
+    measured once per type and other values every time.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return str_size(value)
+    cls = type(value)
+    if not isinstance(value, _FIXED_SIZE_TYPES):
+        return sys.getsizeof(value)
+    size = _VALUE_SIZES.get(cls)
+    if size is None:
+        size = sys.getsizeof(value)
+        _VALUE_SIZES[cls] = size
+    return size
+
+
+def strings_size(strings: List[str]) -> int:
+    """
+    Estimate the size of a list of strings, such as a shared strings table.
+
+    Args:
+        strings (List[str]): The strings.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    return sys.getsizeof(strings) + sum(str_size(string) for string in strings if string)
+
+
+def cell_size(cell: Cell, deep: bool = True) -> int:
+    """
+    Estimate the size of a cell.
+
+    The value of a StringCell points into the shared strings table of its
+    workbook and is not counted.
+
+    Args:
+        cell (Cell): The cell.
+        deep (bool): Include the values of the cell.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    size = instance_size(cell)
+    if deep:
+        size += value_size(cell.raw_value)
+        if cell.value is not cell.raw_value and not isinstance(cell, StringCell):
+            size += value_size(cell.value)
+    return size
+
+
+def worksheet_usage(worksheet, deep: bool = True) -> Dict[str, Any]:
+    """
+    Report the memory used by the cells of a worksheet.
+
+    Args:
+        worksheet (Worksheet): The worksheet.
+        deep (bool): Include the values of the cells.
+
+    Returns:
+        Dict[str, Any]: The report, with the keys:
+            "total": the size of the worksheet in bytes,
+            "rows": the size of the worksheet object and its row lists,
+            "by_column": the size of the cells of every column,
+            "by_type": the size of the cells of every Cell subclass.
+    """
+    rows = instance_size(worksheet) + sys.getsizeof(worksheet.cells)
+    by_column: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+
+    for row in worksheet.cells:
+        rows += sys.getsizeof(row)
+        for cell in row:
+            size = cell_size(cell, deep)
+            by_column[cell.col] = by_column.get(cell.col, 0) + size
+            name = type(cell).__name__
+            by_type[name] = by_type.get(name, 0) + size
+
+    return {
+        "total": rows + sum(by_type.values()),
+        "rows": rows,
+        "by_column": by_column,
+        "by_type": by_type,
+    }
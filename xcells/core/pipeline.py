@@ -0,0 +1,84 @@
+import queue
+import threading
+import zipfile
+from typing import Iterator
+from lxml import etree
+
+_DONE = object()
+
+
+def iter_member_chunks(zipf: zipfile.ZipFile, name: str,
+                       chunk_size: int = 256 * 1024, depth: int = 4) -> Iterator[bytes]:
+    """
+    Yield the decompressed chunks of an archive member.
+
+    A producer thread inflates the member into a bounded buffer of `depth`
+    chunks while the caller consumes the previous ones, so decompression
+    overlaps with whatever the caller does with the data.
+
+    Args:
+        zipf (zipfile.ZipFile): The open archive.
+        name (str): The name of the member.
+        chunk_size (int): The size of the decompressed chunks.
+        depth (int): The number of chunks buffered ahead of the consumer.
+
+    Yields:
+        bytes: The decompressed chunks of the member.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            with zipf.open(name) as member:
+                while True:
+                    chunk = member.read(chunk_size)
+                    if not chunk or not put(chunk):
+                        break
+            put(_DONE)
+        except BaseException as error:
+            put(error)
+
+    producer = threading.Thread(target=produce, name=f"xcells-inflate-{name}", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def parse_member(zipf: zipfile.ZipFile, name: str,
+                 chunk_size: int = 256 * 1024, depth: int = 4) -> etree._Element:
+    """
+    Parse an XML archive member while it is being inflated.
+
+    Args:
+        zipf (zipfile.ZipFile): The open archive.
+        name (str): The name of the member.
+        chunk_size (int): The size of the decompressed chunks.
+        depth (int): The number of chunks buffered ahead of the parser.
+
+    Returns:
+        etree._Element: The root element of the parsed document.
+    """
+    parser = etree.XMLParser()
+    for chunk in iter_member_chunks(zipf, name, chunk_size, depth):
+        parser.feed(chunk)
+    return parser.close()
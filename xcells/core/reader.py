@@ -1,11 +1,20 @@
+import os
+import re
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Optional, Union
 from lxml import etree
 from .workbook import Workbook
 from .worksheet import Worksheet
 from .cell import CellFabric
+from .row_index import RowIndex
+from .pipeline import parse_member
 from .logger_config import logger
 from .namespaces import NAMESPACES as ns
 
+_CELL_REFERENCE = re.compile(r'([A-Z]+)(\d+)')
 
 
 class Reader:
@@ -14,9 +23,15 @@ class Reader:
 
     Attributes:
         _instance (Reader): The singleton instance of the Reader class.
+        _cell_fabric_lock (Lock): Serializes setting the styles of the
+            CellFabric singleton and building cells with them.
+        _sheets_in_flight (int): The number of worksheets parsed ahead of
+            the one being turned into cells in pipelined mode.
     """
 
     _instance = None
+    _cell_fabric_lock = threading.Lock()
+    _sheets_in_flight = 1
 
     def __new__(cls, *args, **kwargs) -> 'Reader':
         """
@@ -33,12 +48,28 @@ class Reader:
             cls._instance = super(Reader, cls).__new__(cls, *args, **kwargs)
         return cls._instance
 
-    def read(self, filename: str) -> 'Workbook':
+    def read(self, filename: str,
+             sheet_ids: Optional[Iterable[str]] = None,
+             row_index: bool = False,
+             pipelined: bool = False) -> 'Workbook':
         """
         Read an Excel file in .xlsx format.
 
         Args:
             filename (str): The path to the Excel file.
+            sheet_ids (Iterable[str], optional): Only parse the worksheets
+                with these sheet ids. All worksheets are parsed by default.
+            row_index (bool): Index the rows of the worksheets instead of
+                parsing them. The cells of an indexed worksheet are parsed on
+                demand with `Worksheet.rows`. The index of every worksheet is
+                stored in a sidecar file next to the workbook and reused by
+                later reads.
+            pipelined (bool): Experimental. Inflate and parse the archive
+                members on worker threads. Every member is parsed while it
+                is being inflated, and the shared strings, styles and the
+                next worksheet are prefetched concurrently. It uses more
+                memory than a sequential read and has not been shown to be
+                faster: on a single core it is slightly slower.
 
         Returns:
             Workbook: The parsed workbook object.
@@ -51,37 +82,182 @@ class Reader:
             raise ValueError("File must be in .xlsx format")
 
         workbook = Workbook()
+        workbook.filename = filename
 
         with zipfile.ZipFile(filename, 'r') as zipf:
+            if pipelined:
+                self._read_pipelined(filename, zipf, workbook, sheet_ids, row_index)
+                return workbook
+
             workbook_xml = zipf.read('xl/workbook.xml')
             workbook._shared_strings = self._extract_shared_strings(
                 zipf.read('xl/sharedStrings.xml'))
             
             sheets = self._parse_workbook(workbook_xml)
+            if sheet_ids is not None:
+                wanted = set(sheet_ids)
+                sheets = [sheet for sheet in sheets if sheet.sheet_id in wanted]
             
             styles_list = self._extract_cell_styles(
                 zipf.read('xl/styles.xml'))
-            CellFabric(styles_list)
 
             for sheet in sheets:
-                sheet.cells = self._parse_worksheet(
-                    zipf.read(f'xl/worksheets/sheet{sheet.sheet_id}.xml'))
+                member = f'xl/worksheets/sheet{sheet.sheet_id}.xml'
+                if row_index:
+                    self._index_worksheet(filename, member, sheet, styles_list, workbook)
+                else:
+                    sheet.cells = self._build_cells(zipf.read(member), styles_list)
+                    sheet.row_count = len(sheet.cells)
 
                 workbook.add_worksheet(sheet)
 
         return workbook
 
-    def _parse_workbook(self, xml_data: bytes) -> list:
+    def _read_pipelined(self, filename: str, zipf: zipfile.ZipFile,
+                        workbook: 'Workbook', sheet_ids: Optional[Iterable[str]],
+                        row_index: bool) -> None:
+        """
+        Read the members of an Excel file on worker threads.
+
+        Args:
+            filename (str): The path to the Excel file.
+            zipf (zipfile.ZipFile): The open archive.
+            workbook (Workbook): The workbook to fill.
+            sheet_ids (Iterable[str], optional): Only parse the worksheets
+                with these sheet ids.
+            row_index (bool): Index the rows of the worksheets instead of
+                parsing them.
+        """
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            workbook_root = executor.submit(parse_member, zipf, 'xl/workbook.xml')
+            shared_strings_root = executor.submit(parse_member, zipf, 'xl/sharedStrings.xml')
+            styles_root = executor.submit(parse_member, zipf, 'xl/styles.xml')
+
+            sheets = self._parse_workbook(workbook_root.result())
+            if sheet_ids is not None:
+                wanted = set(sheet_ids)
+                sheets = [sheet for sheet in sheets if sheet.sheet_id in wanted]
+
+            members = [f'xl/worksheets/sheet{sheet.sheet_id}.xml' for sheet in sheets]
+            sheet_roots = {}
+
+            def prefetch(position: int) -> None:
+                # Only a few worksheet trees are kept alive at once, the
+                # next one is submitted when one is turned into cells.
+                if not row_index and position < len(members):
+                    sheet_roots[position] = executor.submit(
+                        parse_member, zipf, members[position])
+
+            for position in range(self._sheets_in_flight):
+                prefetch(position)
+
+            workbook._shared_strings = self._extract_shared_strings(
+                shared_strings_root.result())
+            styles_list = self._extract_cell_styles(styles_root.result())
+
+            for position, (sheet, member) in enumerate(zip(sheets, members)):
+                if row_index:
+                    self._index_worksheet(filename, member, sheet, styles_list, workbook)
+                else:
+                    root = sheet_roots.pop(position)
+                    prefetch(position + self._sheets_in_flight)
+                    sheet.cells = self._build_cells(root.result(), styles_list)
+                    sheet.row_count = len(sheet.cells)
+                    root = None
+
+                workbook.add_worksheet(sheet)
+
+    def _index_worksheet(self, filename: str, member: str, sheet: Worksheet,
+                         styles_list: list, workbook: 'Workbook') -> None:
+        """
+        Attach a row index to a worksheet so its rows are parsed on demand.
+
+        Args:
+            filename (str): The path to the Excel file.
+            member (str): The name of the worksheet member in the archive.
+            sheet (Worksheet): The worksheet to index.
+            styles_list (list): The cell styles of the workbook.
+            workbook (Workbook): The workbook the worksheet belongs to.
+        """
+        index = self._load_row_index(filename, member, sheet.sheet_id)
+        sheet._row_loader = partial(self._read_rows, index, styles_list, workbook)
+        sheet.row_count = index.row_count
+
+    def _load_row_index(self, filename: str, member: str, sheet_id: str) -> RowIndex:
+        """
+        Load the row index of a worksheet from its sidecar file, or build it.
+
+        Args:
+            filename (str): The path to the Excel file.
+            member (str): The name of the worksheet member in the archive.
+            sheet_id (str): The identifier of the worksheet.
+
+        Returns:
+            RowIndex: The row index of the worksheet.
+        """
+        sidecar = RowIndex.sidecar_path(filename, sheet_id)
+        index = RowIndex.load(sidecar, filename)
+        if index is not None:
+            return index
+
+        index = RowIndex.build(filename, member)
+        try:
+            index.save(sidecar)
+        except OSError as error:
+            logger.warning(f"Could not save row index {sidecar}: {error}")
+        return index
+
+    def _read_rows(self, index: RowIndex, styles_list: list,
+                   workbook: 'Workbook', start: int, stop: int) -> list:
+        """
+        Parse a window of rows of an indexed worksheet.
+
+        Args:
+            index (RowIndex): The row index of the worksheet.
+            styles_list (list): The cell styles of the workbook.
+            workbook (Workbook): The workbook the worksheet belongs to.
+            start (int): The index of the first row.
+            stop (int): The index after the last row.
+
+        Returns:
+            list: A list of rows, where each row is a list of Cell objects.
+        """
+        if start >= stop or start >= index.row_count:
+            return []
+
+        rows = self._build_cells(index.read_window(start, stop), styles_list)
+        workbook._fill_rows(rows)
+        return rows
+
+    def _build_cells(self, xml_data: Union[bytes, etree._Element], styles_list: list) -> list:
+        """
+        Parse XML data for a worksheet with the cell styles of its workbook.
+
+        The styles are set on the CellFabric singleton, so they are set and
+        used under a lock shared by every thread building cells.
+
+        Args:
+            xml_data (bytes | etree._Element): The XML data of the worksheet, or its parsed root.
+            styles_list (list): The cell styles of the workbook.
+
+        Returns:
+            list: A list of rows, where each row is a list of Cell objects.
+        """
+        with self._cell_fabric_lock:
+            CellFabric(styles_list)
+            return self._parse_worksheet(xml_data)
+
+    def _parse_workbook(self, xml_data: Union[bytes, etree._Element]) -> list:
         """
         Parse XML data for the workbook.
 
         Args:
-            xml_data (bytes): The XML data of the workbook.
+            xml_data (bytes | etree._Element): The XML data of the workbook, or its parsed root.
 
         Returns:
             list: A list of Worksheet objects.
         """
-        root = etree.fromstring(xml_data)
+        root = self._to_root(xml_data)
 
         sheets = []
         for sheet in root.findall('.//xl:sheets/xl:sheet', ns):
@@ -93,17 +269,17 @@ class Reader:
 
         return sheets
 
-    def _parse_worksheet(self, xml_data: bytes) -> list:
+    def _parse_worksheet(self, xml_data: Union[bytes, etree._Element]) -> list:
         """
         Parse XML data for the worksheet.
 
         Args:
-            xml_data (bytes): The XML data of the worksheet.
+            xml_data (bytes | etree._Element): The XML data of the worksheet, or its parsed root.
 
         Returns:
             list: A list of rows, where each row is a list of Cell objects.
         """
-        root = etree.fromstring(xml_data)
+        root = self._to_root(xml_data)
         sheet_data = []
         
         cell_fabric = CellFabric()
@@ -111,11 +287,11 @@ class Reader:
         for row in root.findall('.//xl:row', ns):
             row_data = []
             for cell_pos in row.findall('.//xl:c', ns):
-                pos = cell_pos.get('r')
+                col, row_number = _CELL_REFERENCE.match(cell_pos.get('r')).groups()
                 cell_style = int(cell_pos.get('s'))
                 cell_type = cell_pos.get('t')
                 
-                cell = cell_fabric.create_cell(pos[0], pos[1], 
+                cell = cell_fabric.create_cell(col, row_number, 
                     cell_pos.find('.//xl:v', ns).text, cell_style)
                 row_data.append(cell)
             sheet_data.append(row_data)
@@ -124,17 +300,17 @@ class Reader:
                      f"with first row data id: {sheet_data[0]}")
         return sheet_data
     
-    def _extract_cell_styles(self, xml_data: bytes) -> list:
+    def _extract_cell_styles(self, xml_data: Union[bytes, etree._Element]) -> list:
         """
         Extract cell styles from the XML data.
 
         Args:
-            xml_data (bytes): The XML data of the cell styles.
+            xml_data (bytes | etree._Element): The XML data of the cell styles, or its parsed root.
 
         Returns:
             list: A list of cell styles.
         """
-        root = etree.fromstring(xml_data)
+        root = self._to_root(xml_data)
 
         cell_styles = []
         for elem in root.findall('.//xl:cellXfs/xl:xf', ns):
@@ -146,21 +322,36 @@ class Reader:
 
         return cell_styles
 
-    def _extract_shared_strings(self, xml_data: bytes) -> list:
+    def _extract_shared_strings(self, xml_data: Union[bytes, etree._Element]) -> list:
         """
         Extract shared strings from the XML data.
 
         Args:
-            xml_data (bytes): The XML data of the shared strings.
+            xml_data (bytes | etree._Element): The XML data of the shared strings, or its parsed root.
 
         Returns:
             list: A list of shared strings.
         """
-        root = etree.fromstring(xml_data)
+        root = self._to_root(xml_data)
 
         shared_strings = [elem.text for elem in root.findall('.//xl:t', ns)]
 
         logger.debug(f"Found {len(shared_strings)} shared strings " +
-                     f"with first string: {shared_strings[0]}")
+                     f"with first string: {shared_strings[0] if shared_strings else None}")
 
         return shared_strings
+
+    @staticmethod
+    def _to_root(xml_data: Union[bytes, etree._Element]) -> etree._Element:
+        """
+        Return the root element of XML data, parsing it if needed.
+
+        Args:
+            xml_data (bytes | etree._Element): The XML data, or its parsed root.
+
+        Returns:
+            etree._Element: The root element.
+        """
+        if isinstance(xml_data, etree._Element):
+            return xml_data
+        return etree.fromstring(xml_data)
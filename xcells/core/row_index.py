@@ -0,0 +1,346 @@
+import bisect
+import json
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from typing import Iterator, List, Optional, Tuple
+from .logger_config import logger
+
+_ROW_TAG = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?row[\s>/]')
+_SHEET_DATA_TAG = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?sheetData)(?:\s[^>]*)?(/?)>')
+_SHEET_DATA_END = re.compile(rb'</(?:[A-Za-z_][\w.-]*:)?sheetData\s*>')
+_ROOT_TAG = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?worksheet)[\s>]')
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+_INDEX_VERSION = 1
+
+
+class RowIndex:
+    """
+    An index of row offsets in the decompressed XML of a worksheet.
+
+    The index records the decompressed byte offset of every `every`-th row of
+    the sheet, which lets a window of rows be cut out of the XML and parsed on
+    its own. For deflated members it also keeps snapshots of the decompressor
+    state, taken roughly every `snapshot_bytes` of output, so reading a window
+    only inflates from the nearest snapshot instead of from the start of the
+    member. Snapshots can't be serialized: an index loaded from a sidecar
+    file takes them again during the first reads that pass over them.
+
+    Attributes:
+        filename (str): The path to the Excel file.
+        member (str): The name of the worksheet member in the archive.
+        row_count (int): The number of rows in the worksheet.
+        every (int): The number of rows between two checkpoints.
+    """
+
+    def __init__(self, filename: str, member: str, every: int = 1000,
+                 snapshot_bytes: int = 1024 * 1024):
+        """
+        Initialize an empty RowIndex object. Use `build` or `load` to fill it.
+
+        Args:
+            filename (str): The path to the Excel file.
+            member (str): The name of the worksheet member in the archive.
+            every (int): The number of rows between two checkpoints.
+            snapshot_bytes (int): The decompressed distance between two
+                decompressor snapshots.
+        """
+        if every <= 0:
+            raise ValueError("every must be positive")
+
+        self.filename = filename
+        self.member = member
+        self.every = every
+        self.snapshot_bytes = snapshot_bytes
+        self.row_count = 0
+
+        self._header = b''
+        self._footer = b''
+        self._data_end = 0
+        self._checkpoints: List[int] = []
+        self._crc = 0
+        self._compress_type = zipfile.ZIP_STORED
+        self._compress_size = 0
+        self._data_start = 0
+        self._chunk_size = 64 * 1024
+        # Sorted (out_offset, in_offset, decompressor) tuples, shared by
+        # concurrent reads of the same worksheet.
+        self._snapshots: List[Tuple[int, int, object]] = []
+        self._snapshots_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, filename: str, member: str, every: int = 1000,
+              snapshot_bytes: int = 1024 * 1024) -> 'RowIndex':
+        """
+        Build the index in a single streaming pass over a worksheet member.
+
+        Args:
+            filename (str): The path to the Excel file.
+            member (str): The name of the worksheet member in the archive.
+            every (int): The number of rows between two checkpoints.
+            snapshot_bytes (int): The decompressed distance between two
+                decompressor snapshots.
+
+        Returns:
+            RowIndex: The built index.
+        """
+        index = cls(filename, member, every, snapshot_bytes)
+        index._locate()
+
+        buffer = b''
+        buffer_start = 0
+        scan_from = 0
+        in_data = False
+        row_count = 0
+
+        for chunk in index._inflate(0):
+            buffer += chunk
+
+            if not in_data:
+                match = _SHEET_DATA_TAG.search(buffer)
+                if not match:
+                    continue
+                index._footer = index._make_footer(buffer, match.group(1))
+                if match.group(2):
+                    # An empty <sheetData/> element, there are no rows.
+                    index._header = buffer[:match.start()] + b'<' + match.group(1) + b'>'
+                    break
+                index._header = buffer[:match.end()]
+                in_data = True
+                scan_from = match.end()
+
+            position = scan_from - buffer_start
+            end = _SHEET_DATA_END.search(buffer, position)
+            limit = end.start() if end else len(buffer)
+            for match in _ROW_TAG.finditer(buffer, position, limit):
+                if row_count % every == 0:
+                    index._checkpoints.append(buffer_start + match.start())
+                row_count += 1
+                scan_from = buffer_start + match.end()
+
+            if end:
+                index._data_end = buffer_start + end.start()
+                break
+
+            # Keep a short tail so tags split between chunks are still found.
+            cut = max(len(buffer) - 64, scan_from - buffer_start)
+            buffer_start += cut
+            buffer = buffer[cut:]
+            scan_from = max(scan_from, buffer_start)
+        else:
+            raise ValueError(f"{member} does not contain sheetData")
+
+        index.row_count = row_count
+        logger.debug(f"Indexed {row_count} rows of {member} " +
+                     f"with {len(index._checkpoints)} checkpoints")
+        return index
+
+    @classmethod
+    def load(cls, path: str, filename: str) -> Optional['RowIndex']:
+        """
+        Load an index from a sidecar file.
+
+        Args:
+            path (str): The path to the sidecar file.
+            filename (str): The path to the Excel file the index belongs to.
+
+        Returns:
+            Optional[RowIndex]: The index, or None if the sidecar file is
+            missing or does not match the worksheet member anymore.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != _INDEX_VERSION:
+            return None
+
+        index = cls(filename, data['member'], data['every'], data['snapshot_bytes'])
+        try:
+            index._locate()
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        if index._crc != data['crc'] or index._compress_size != data['compress_size']:
+            logger.debug(f"Row index {path} is stale, ignoring it")
+            return None
+
+        index.row_count = data['row_count']
+        index._header = data['header'].encode('utf-8')
+        index._footer = data['footer'].encode('utf-8')
+        index._data_end = data['data_end']
+        index._checkpoints = data['checkpoints']
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Save the index to a sidecar file.
+
+        Args:
+            path (str): The path to the sidecar file.
+        """
+        data = {
+            'version': _INDEX_VERSION,
+            'member': self.member,
+            'crc': self._crc,
+            'compress_size': self._compress_size,
+            'every': self.every,
+            'snapshot_bytes': self.snapshot_bytes,
+            'row_count': self.row_count,
+            'header': self._header.decode('utf-8'),
+            'footer': self._footer.decode('utf-8'),
+            'data_end': self._data_end,
+            'checkpoints': self._checkpoints,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+    @staticmethod
+    def sidecar_path(filename: str, sheet_id: str) -> str:
+        """
+        Return the default sidecar path of a worksheet index.
+
+        Args:
+            filename (str): The path to the Excel file.
+            sheet_id (str): The identifier of the worksheet.
+
+        Returns:
+            str: The path to the sidecar file.
+        """
+        return f"{filename}.sheet{sheet_id}.rowidx"
+
+    def read_window(self, start: int, stop: int) -> bytes:
+        """
+        Return a standalone worksheet XML document with rows [start, stop).
+
+        Args:
+            start (int): The index of the first row.
+            stop (int): The index after the last row.
+
+        Returns:
+            bytes: The XML data of the worksheet window.
+        """
+        start = max(0, min(start, self.row_count))
+        stop = max(start, min(stop, self.row_count))
+        if start == stop:
+            return self._header + self._footer
+
+        checkpoint = start // self.every
+        offset = self._checkpoints[checkpoint]
+        first = start - checkpoint * self.every
+        last = stop - checkpoint * self.every
+
+        buffer = b''
+        begin = 0
+        ordinal = 0
+        scan_from = 0
+        for chunk in self._inflate(offset):
+            buffer += chunk
+            for match in _ROW_TAG.finditer(buffer, scan_from):
+                if ordinal == first:
+                    begin = match.start()
+                elif ordinal == last:
+                    return self._header + buffer[begin:match.start()] + self._footer
+                ordinal += 1
+                scan_from = match.end()
+
+            if offset + len(buffer) >= self._data_end:
+                break
+            # Step back a little so tags split between chunks are found.
+            scan_from = max(scan_from, len(buffer) - 64)
+
+        return self._header + buffer[begin:self._data_end - offset] + self._footer
+
+    def _locate(self) -> None:
+        """Find the compressed data of the member inside the archive."""
+        with zipfile.ZipFile(self.filename, 'r') as zipf:
+            info = zipf.getinfo(self.member)
+
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise ValueError(f"Unsupported compression of {self.member}")
+
+        with open(self.filename, 'rb') as file:
+            file.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(file.read(_LOCAL_HEADER.size))
+
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local header of {self.member}")
+
+        self._data_start = info.header_offset + _LOCAL_HEADER.size + header[9] + header[10]
+        self._compress_type = info.compress_type
+        self._compress_size = info.compress_size
+        self._crc = info.CRC
+
+    @staticmethod
+    def _make_footer(header: bytes, sheet_data_tag: bytes) -> bytes:
+        """Build the closing tags that complete a window of rows."""
+        match = _ROOT_TAG.search(header)
+        root_tag = match.group(1) if match else b'worksheet'
+        return b'</' + sheet_data_tag + b'></' + root_tag + b'>'
+
+    def _inflate(self, offset: int) -> Iterator[bytes]:
+        """
+        Yield the decompressed member data starting at `offset`.
+
+        Deflated data is inflated from the nearest decompressor snapshot at
+        or before `offset`, and new snapshots are taken along the way.
+        """
+        with open(self.filename, 'rb') as file:
+            if self._compress_type == zipfile.ZIP_STORED:
+                file.seek(self._data_start + offset)
+                remaining = self._compress_size - offset
+                while remaining > 0:
+                    chunk = file.read(min(self._chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+                return
+
+            with self._snapshots_lock:
+                # The in_offset sentinel keeps the comparison off the states.
+                position = bisect.bisect_right(self._snapshots, (offset, float('inf'))) - 1
+                if position >= 0:
+                    out_offset, in_offset, state = self._snapshots[position]
+                    decompressor = state.copy()
+            if position < 0:
+                out_offset, in_offset = 0, 0
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+            file.seek(self._data_start + in_offset)
+            remaining = self._compress_size - in_offset
+            next_snapshot = out_offset + self.snapshot_bytes
+
+            while remaining > 0 and not decompressor.eof:
+                data = file.read(min(self._chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                in_offset += len(data)
+
+                chunk = decompressor.decompress(data)
+                chunk_start = out_offset
+                out_offset += len(chunk)
+
+                if out_offset >= next_snapshot:
+                    self._add_snapshot(out_offset, in_offset, decompressor)
+                    next_snapshot = out_offset + self.snapshot_bytes
+
+                if out_offset <= offset:
+                    continue
+                yield chunk[max(0, offset - chunk_start):]
+
+    def _add_snapshot(self, out_offset: int, in_offset: int, decompressor) -> None:
+        """Remember the decompressor state at a point of the member."""
+        state = decompressor.copy()
+        with self._snapshots_lock:
+            position = bisect.bisect_left(self._snapshots, (out_offset,))
+            if position < len(self._snapshots) and self._snapshots[position][0] == out_offset:
+                return
+            self._snapshots.insert(position, (out_offset, in_offset, state))
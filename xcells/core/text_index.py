@@ -0,0 +1,261 @@
+import bisect
+import json
+import re
+import zipfile
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from lxml import etree
+from .cell import StringCell
+from .logger_config import logger
+from .namespaces import NAMESPACES as ns
+
+_TOKEN = re.compile(r'\w+')
+_CELL_REFERENCE = re.compile(r'([A-Z]+)(\d+)')
+_ROW_TAG = f"{{{ns['xl']}}}row"
+_CELL_TAG = f"{{{ns['xl']}}}c"
+_VALUE_TAG = f"{{{ns['xl']}}}v"
+
+_INDEX_VERSION = 2
+
+Position = Tuple[str, str, str]
+
+
+def _normalize(text: str) -> str:
+    """Normalize a string for case-insensitive matching."""
+    return text.strip().casefold()
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split a string into normalized tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+class TextIndex:
+    """
+    An inverted index of the string cells of a workbook.
+
+    The index is built from the shared strings table: every shared string is
+    tokenized once, and postings map normalized values and tokens to shared
+    string ids. The positions of the cells referencing each shared string are
+    stored as (sheet name, row, column) tuples.
+
+    Attributes:
+        strings (list): The shared strings table of the workbook.
+    """
+
+    def __init__(self, strings: List[str]):
+        """
+        Initialize a TextIndex object without positions.
+
+        Args:
+            strings (list): The shared strings table of the workbook.
+        """
+        self.strings = strings
+        self._positions: Dict[int, List[Position]] = {}
+        self._sheet_ids: Dict[str, str] = {}
+        self._values: Dict[str, List[int]] = {}
+        self._tokens: Dict[str, List[int]] = {}
+
+        for string_id, string in enumerate(strings):
+            if not string:
+                continue
+            self._values.setdefault(_normalize(string), []).append(string_id)
+            for token in set(_tokenize(string)):
+                self._tokens.setdefault(token, []).append(string_id)
+
+        self._sorted_values = sorted(self._values)
+        self._sorted_tokens = sorted(self._tokens)
+
+    @classmethod
+    def build(cls, workbook) -> 'TextIndex':
+        """
+        Build the index of a workbook.
+
+        The worksheets of a workbook read from a file are streamed from it,
+        and every cell of type "s" references a shared string whatever its
+        number format. Worksheets read with a row index are indexed too.
+        Worksheets missing from the file are indexed from their StringCell
+        cells.
+
+        Args:
+            workbook (Workbook): The workbook to index.
+
+        Returns:
+            TextIndex: The built index.
+        """
+        index = cls(workbook._shared_strings)
+        zipf = zipfile.ZipFile(workbook.filename, 'r') if workbook.filename else None
+        try:
+            for sheet in workbook.worksheets:
+                index._sheet_ids[sheet.name] = sheet.sheet_id
+                member = f'xl/worksheets/sheet{sheet.sheet_id}.xml'
+                if zipf is not None and member in zipf.namelist():
+                    index._index_member(zipf, member, sheet.name)
+                    continue
+                for row in sheet.cells:
+                    for cell in row:
+                        if isinstance(cell, StringCell):
+                            index._positions.setdefault(cell.value_id, []).append(
+                                (sheet.name, cell.row, cell.col))
+        finally:
+            if zipf is not None:
+                zipf.close()
+
+        logger.debug(f"Indexed {len(index.strings)} shared strings " +
+                     f"referenced by {len(index._positions)} distinct values")
+        return index
+
+    def _index_member(self, zipf: zipfile.ZipFile, member: str, name: str) -> None:
+        """Stream a worksheet and record the positions of its shared string cells."""
+        with zipf.open(member) as data:
+            for _, row in etree.iterparse(data, events=('end',), tag=_ROW_TAG):
+                for cell in row.iterfind(_CELL_TAG):
+                    value = cell.find(_VALUE_TAG)
+                    if cell.get('t') != 's' or value is None or value.text is None:
+                        continue
+                    reference = _CELL_REFERENCE.match(cell.get('r') or '')
+                    if reference is None:
+                        continue
+                    col, row_number = reference.groups()
+                    self._positions.setdefault(int(value.text), []).append((name, row_number, col))
+
+                row.clear()
+                while row.getprevious() is not None:
+                    del row.getparent()[0]
+
+    @classmethod
+    def load(cls, path: str, filename: str) -> Optional['TextIndex']:
+        """
+        Load an index saved with `save`.
+
+        Args:
+            path (str): The path to the index file.
+            filename (str): The path to the Excel file the index belongs to.
+
+        Returns:
+            Optional[TextIndex]: The index, or None if the index file is
+            missing or does not match the workbook anymore.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != _INDEX_VERSION:
+            return None
+
+        try:
+            members = cls._member_signatures(filename, data['sheet_ids'])
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return None
+        if members != {name: tuple(signature) for name, signature in data['members'].items()}:
+            logger.debug(f"Text index {path} is stale, ignoring it")
+            return None
+
+        index = cls(data['strings'])
+        index._sheet_ids = data['sheet_ids']
+        index._positions = {int(string_id): [tuple(position) for position in positions]
+                            for string_id, positions in data['positions'].items()}
+        return index
+
+    def save(self, path: str, filename: str) -> None:
+        """
+        Save the index to a file. The CRC and size of the workbook members
+        the index was built from are stored with it, so `load` can detect a
+        stale index. Postings are rebuilt from the strings when the index is
+        loaded.
+
+        Args:
+            path (str): The path to the index file.
+            filename (str): The path to the Excel file the index was built from.
+        """
+        data = {
+            'version': _INDEX_VERSION,
+            'members': self._member_signatures(filename, self._sheet_ids),
+            'sheet_ids': self._sheet_ids,
+            'strings': self.strings,
+            'positions': self._positions,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    @staticmethod
+    def _member_signatures(filename: str, sheet_ids: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+        """Return the (CRC, size) of the members the positions depend on."""
+        members = ['xl/workbook.xml', 'xl/sharedStrings.xml'] + [
+            f'xl/worksheets/sheet{sheet_id}.xml' for sheet_id in sheet_ids.values()]
+        with zipfile.ZipFile(filename, 'r') as zipf:
+            infos = {member: zipf.getinfo(member) for member in members}
+        return {member: (info.CRC, info.file_size) for member, info in infos.items()}
+
+    @staticmethod
+    def sidecar_path(filename: str) -> str:
+        """
+        Return the default path of the index of a workbook file.
+
+        Args:
+            filename (str): The path to the Excel file.
+
+        Returns:
+            str: The path to the index file.
+        """
+        return f"{filename}.textidx"
+
+    def find(self, text: str, exact: bool = False) -> List[Position]:
+        """
+        Find the string cells matching a text, ignoring case.
+
+        Args:
+            text (str): The text to search for.
+            exact (bool): Match whole cell values only. By default cells
+                containing all the tokens of the text are matched.
+
+        Returns:
+            List[Position]: The (sheet name, row, column) of the matching cells.
+        """
+        if exact:
+            return self._collect(self._values.get(_normalize(text), []))
+
+        tokens = _tokenize(text)
+        if not tokens:
+            return []
+
+        postings = sorted((self._tokens.get(token, []) for token in set(tokens)), key=len)
+        string_ids = set(postings[0])
+        for posting in postings[1:]:
+            string_ids.intersection_update(posting)
+            if not string_ids:
+                break
+        return self._collect(string_ids)
+
+    def find_prefix(self, prefix: str) -> List[Position]:
+        """
+        Find the string cells with a value or a token starting with a prefix,
+        ignoring case.
+
+        Args:
+            prefix (str): The prefix to search for.
+
+        Returns:
+            List[Position]: The (sheet name, row, column) of the matching cells.
+        """
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+
+        string_ids: Set[int] = set()
+        for keys, postings in ((self._sorted_values, self._values),
+                               (self._sorted_tokens, self._tokens)):
+            start = bisect.bisect_left(keys, prefix)
+            for key in keys[start:]:
+                if not key.startswith(prefix):
+                    break
+                string_ids.update(postings[key])
+        return self._collect(string_ids)
+
+    def _collect(self, string_ids: Iterable[int]) -> List[Position]:
+        """Return the positions of the cells referencing the shared strings."""
+        positions = []
+        for string_id in sorted(string_ids):
+            positions.extend(self._positions.get(string_id, []))
+        return positions
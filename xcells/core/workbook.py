@@ -1,15 +1,21 @@
+import sys
 from .worksheet import Worksheet
-from .cell import StringCell
-from typing import List, Optional
+from .cell import Cell, StringCell
+from .memory import strings_size
+from .text_index import Position, TextIndex
+from typing import Any, Dict, List, Optional
 
 class Workbook:
     def __init__(self):
         self.worksheets: List[Worksheet] = []
         self._shared_strings: List[str] = []
+        self.filename: Optional[str] = None
+        self.text_index: Optional[TextIndex] = None
         
     def add_worksheet(self, worksheet: Worksheet) -> None:
         """Add a worksheet to the workbook"""
         self._fill_cell_values(worksheet)
+        self.text_index = None
         self.worksheets.append(worksheet)
 
     def get_worksheets(self) -> List[Worksheet]:
@@ -22,9 +28,76 @@ class Workbook:
             return self.worksheets[index]
         return None
     
+    def build_text_index(self) -> TextIndex:
+        """Build the text index of the string cells and keep it on the workbook"""
+        self.text_index = TextIndex.build(self)
+        return self.text_index
+
+    def attach_text_index(self, index: TextIndex) -> None:
+        """
+        Attach an index loaded with TextIndex.load to the workbook, so find
+        and find_prefix use it instead of building a new one. Raises
+        ValueError if the index was built from another shared strings table.
+        """
+        if index.strings != self._shared_strings:
+            raise ValueError("Text index does not match the shared strings of the workbook")
+        self.text_index = index
+
+    def find(self, text: str, exact: bool = False) -> List[Position]:
+        """
+        Find the string cells containing all the tokens of a text, or equal
+        to it with exact=True. Returns (sheet name, row, column) tuples.
+        The text index is built on first use.
+        """
+        if self.text_index is None:
+            self.build_text_index()
+        return self.text_index.find(text, exact)
+
+    def find_prefix(self, prefix: str) -> List[Position]:
+        """
+        Find the string cells with a value or a token starting with a prefix.
+        Returns (sheet name, row, column) tuples. The text index is built on
+        first use.
+        """
+        if self.text_index is None:
+            self.build_text_index()
+        return self.text_index.find_prefix(prefix)
+
+    def memory_usage(self, deep: bool = True) -> Dict[str, Any]:
+        """
+        Report the memory used by the workbook.
+        
+        The report contains the "total" size in bytes, the report of every
+        worksheet by name under "sheets" (see Worksheet.memory_usage), the
+        size of the "shared_strings" table and the size of the cells of
+        every Cell subclass across all worksheets under "by_type".
+        
+        With deep=False the values of the cells and the strings of the
+        shared strings table are not counted.
+        """
+        sheets = {sheet.name: sheet.memory_usage(deep) for sheet in self.worksheets}
+        shared_strings = (strings_size(self._shared_strings) if deep
+                          else sys.getsizeof(self._shared_strings))
+
+        by_type: Dict[str, int] = {}
+        for report in sheets.values():
+            for name, size in report["by_type"].items():
+                by_type[name] = by_type.get(name, 0) + size
+
+        return {
+            "total": shared_strings + sum(report["total"] for report in sheets.values()),
+            "sheets": sheets,
+            "shared_strings": shared_strings,
+            "by_type": by_type,
+        }
+
     def _fill_cell_values(self, worksheet: Worksheet) -> None:
         """Fill cell values"""
-        for row in worksheet.cells:
+        self._fill_rows(worksheet.cells)
+
+    def _fill_rows(self, rows: List[List[Cell]]) -> None:
+        """Fill cell values of a list of rows"""
+        for row in rows:
             for cell in row:
                 if isinstance(cell, StringCell):
                     cell.value = self._shared_strings[cell.value_id]
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 from .cell import Cell
+from .memory import worksheet_usage
 
 class Worksheet:
     """
@@ -13,6 +14,8 @@ class Worksheet:
         The identifier of the worksheet.
     cells : list
         A list to store cells in the worksheet.
+    row_count : int
+        The number of rows in the worksheet.
     
     Methods:
     --------
@@ -20,6 +23,10 @@ class Worksheet:
         Returns a string representation of the worksheet.
     get_cell(row: int, col: int) -> Optional[Cell]:
         Get the value of a cell.
+    rows(start: int, stop: Optional[int]) -> List[List[Cell]]:
+        Get a window of rows.
+    memory_usage(deep: bool) -> Dict[str, Any]:
+        Report the memory used by the cells.
     """
     def __init__(self, sheet_id: int, name: str):
         """
@@ -35,6 +42,8 @@ class Worksheet:
         self.name = name
         self.sheet_id = sheet_id
         self.cells = []
+        self.row_count = 0
+        self._row_loader: Optional[Callable[[int, int], List[List[Cell]]]] = None
         
     def __str__(self) -> str:
         """
@@ -63,4 +72,55 @@ class Worksheet:
         Optional[Cell]
             The cell at the specified row and column, or None if not found.
         """
-        return self.cells.get((row, col), None)
\ No newline at end of file
+        return self.cells.get((row, col), None)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[List[Cell]]:
+        """
+        Get a window of rows.
+        
+        Worksheets read with a row index are not loaded into memory, their
+        rows are parsed on demand from the requested window only.
+        
+        Parameters:
+        -----------
+        start : int
+            The index of the first row.
+        stop : Optional[int]
+            The index after the last row, or None for the end of the worksheet.
+        
+        Returns:
+        --------
+        List[List[Cell]]
+            The rows in the window, where each row is a list of Cell objects.
+        """
+        if self._row_loader is None:
+            return self.cells[start:stop]
+        
+        if start < 0 or (stop is not None and stop < 0):
+            raise ValueError("Negative row indexes are not supported")
+        if stop is None:
+            stop = self.row_count
+        return self._row_loader(start, min(stop, self.row_count))
+
+    def memory_usage(self, deep: bool = True) -> Dict[str, Any]:
+        """
+        Report the memory used by the cells of the worksheet.
+        
+        Sizes are estimated from per-class measurements and string lengths
+        instead of measuring every object. String values of StringCell
+        objects belong to the shared strings table of the workbook and are
+        not counted.
+        
+        Parameters:
+        -----------
+        deep : bool
+            Include the values of the cells.
+        
+        Returns:
+        --------
+        Dict[str, Any]
+            The total size in bytes under "total", the size of the row lists
+            under "rows", and the size of the cells broken down "by_column"
+            and "by_type" (Cell subclass name).
+        """
+        return worksheet_usage(self, deep)
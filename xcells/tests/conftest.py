@@ -0,0 +1,81 @@
+import string
+import zipfile
+import pytest
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = string.ascii_uppercase[remainder] + name
+    return name
+
+
+def write_xlsx(path, sheets, compression=zipfile.ZIP_DEFLATED, number_format="2", string_style="1"):
+    """
+    Write a minimal .xlsx file.
+
+    `sheets` maps sheet names to lists of rows. String values are stored in
+    the shared strings table with style `string_style` (1 is numFmtId 49,
+    0 is General), numbers are stored inline with style 2 (numFmtId
+    `number_format`). None leaves the cell out.
+    """
+    shared_strings = []
+    string_ids = {}
+    sheet_entries = []
+    sheet_xmls = []
+
+    for sheet_id, (name, rows) in enumerate(sheets.items(), start=1):
+        sheet_entries.append(f'<sheet name="{name}" sheetId="{sheet_id}" r:id="rId{sheet_id}"/>')
+        xml_rows = []
+        for row_number, row in enumerate(rows, start=1):
+            xml_cells = []
+            for col_index, value in enumerate(row):
+                if value is None:
+                    continue
+                ref = f"{_column_name(col_index)}{row_number}"
+                if isinstance(value, str):
+                    if value not in string_ids:
+                        string_ids[value] = len(shared_strings)
+                        shared_strings.append(value)
+                    xml_cells.append(f'<c r="{ref}" s="{string_style}" t="s"><v>{string_ids[value]}</v></c>')
+                else:
+                    xml_cells.append(f'<c r="{ref}" s="2"><v>{value}</v></c>')
+            xml_rows.append(f'<row r="{row_number}">{"".join(xml_cells)}</row>')
+        sheet_xmls.append(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<sheetData>{"".join(xml_rows)}</sheetData></worksheet>')
+
+    if not shared_strings:
+        shared_strings.append("")
+
+    workbook_xml = (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets>{"".join(sheet_entries)}</sheets></workbook>')
+    shared_strings_xml = (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        + "".join(f"<si><t>{value}</t></si>" for value in shared_strings)
+        + '</sst>')
+    styles_xml = (
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<cellXfs count="3"><xf numFmtId="0"/><xf numFmtId="49"/><xf numFmtId="{number_format}"/></cellXfs>'
+        '</styleSheet>')
+
+    with zipfile.ZipFile(path, "w", compression) as zipf:
+        zipf.writestr("xl/workbook.xml", workbook_xml)
+        zipf.writestr("xl/sharedStrings.xml", shared_strings_xml)
+        zipf.writestr("xl/styles.xml", styles_xml)
+        for sheet_id, sheet_xml in enumerate(sheet_xmls, start=1):
+            zipf.writestr(f"xl/worksheets/sheet{sheet_id}.xml", sheet_xml)
+
+    return str(path)
+
+
+@pytest.fixture
+def make_xlsx(tmp_path):
+    def make(name, sheets, **kwargs):
+        return write_xlsx(tmp_path / name, sheets, **kwargs)
+    return make
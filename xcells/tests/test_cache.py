@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+import pytest
+from xcells.core.cache import WorkbookCache
+from xcells.core.reader import Reader
+
+
+SHEETS = {
+    "First": [["id", "name"], [1, "Alice"], [2, "Bob"]],
+    "Second": [["code"], ["X1"], ["X2"]],
+}
+
+
+def test_cache_hit_and_miss(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+
+    first = cache.get(path)
+    second = cache.get(path)
+
+    assert [sheet.name for sheet in first.worksheets] == ["First", "Second"]
+    assert second.worksheets[0] is first.worksheets[0]
+    assert second.worksheets[0].cells[1][1].value == "Alice"
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+
+
+def test_cache_invalidates_changed_file(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+    cache.get(path)
+
+    make_xlsx("book.xlsx", {"Only": [["changed"]]})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    workbook = cache.get(path)
+    assert [sheet.name for sheet in workbook.worksheets] == ["Only"]
+    assert cache.misses == 2
+
+
+def test_cache_evicts_sheets_individually(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+    cache.get(path)
+    one_sheet = cache._sheets[(os.path.abspath(path), "1")][1]
+
+    cache.max_bytes = cache.size - one_sheet
+    cache._evict()
+    assert cache.evictions == 1
+    assert (os.path.abspath(path), "1") not in cache._sheets
+    assert (os.path.abspath(path), "2") in cache._sheets
+
+    reader = Reader()
+    with patch.object(reader, "read", wraps=reader.read) as read:
+        cache._reader = reader
+        workbook = cache.get(path)
+    read.assert_called_once_with(os.path.abspath(path), sheet_ids=["1"])
+    assert workbook.worksheets[0].cells[2][1].value == "Bob"
+
+
+def test_cache_deduplicates_concurrent_loads(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+    reader = Reader()
+    results = []
+
+    with patch.object(reader, "read", wraps=reader.read) as read:
+        cache._reader = reader
+        threads = [threading.Thread(target=lambda: results.append(cache.get(path)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert read.call_count == 1
+    assert len(results) == 8
+    assert cache.hits + cache.misses == 8
+
+
+def test_cache_shares_loads_of_workbooks_over_budget(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    cache = WorkbookCache(max_bytes=1)
+    reader = Reader()
+    read = reader.read
+    results = []
+
+    def slow_read(*args, **kwargs):
+        # Keep the load in flight until every thread is waiting for it.
+        time.sleep(0.2)
+        return read(*args, **kwargs)
+
+    with patch.object(reader, "read", side_effect=slow_read) as mock_read:
+        cache._reader = reader
+        threads = [threading.Thread(target=lambda: results.append(cache.get(path)))
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_read.call_count == 1
+    assert all(workbook is results[0] for workbook in results)
+    assert (cache.hits, cache.misses) == (5, 1)
+
+
+def test_cache_does_not_store_workbooks_over_budget(make_xlsx):
+    small = make_xlsx("small.xlsx", {"S": [["x"]]})
+    large = make_xlsx("large.xlsx", {"L": [[i, f"value{i}"] for i in range(200)]})
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+    cache.get(small)
+    cache.max_bytes = cache.size * 2
+
+    workbook = cache.get(large)
+
+    assert workbook.worksheets[0].row_count == 200
+    assert os.path.abspath(large) not in cache._entries
+    assert os.path.abspath(small) in cache._entries
+    assert cache.evictions == 0
+
+
+def test_cache_rejects_invalid_budget():
+    with pytest.raises(ValueError, match="max_bytes must be positive"):
+        WorkbookCache(max_bytes=0)
@@ -0,0 +1,141 @@
+import zipfile
+import pytest
+import xcells
+from xcells.core.diff import diff
+
+
+OLD = {
+    "Customers": [["id", "name", "city"], ["c1", "Alice", "Paris"], ["c2", "Bob", "Rome"], ["c3", "Eve", "Oslo"]],
+    "Static": [["a", 1], ["b", 2]],
+    "Gone": [["x"]],
+}
+
+
+def test_diff_is_exported():
+    assert xcells.diff is diff
+
+
+def test_diff_by_position(make_xlsx):
+    old = make_xlsx("old.xlsx", OLD)
+    new = make_xlsx("new.xlsx", {
+        "Customers": [["id", "name", "city"], ["c1", "Alice", "Berlin"], ["c2", "Bob", "Rome"]],
+        "Static": [["a", 1], ["b", 2]],
+        "Gone": [["x"]],
+    })
+
+    result = diff(old, new)
+    customers = result.sheets["Customers"]
+
+    assert customers.removed == [4]
+    assert customers.added == []
+    assert customers.changed == {2: {"C": ("Paris", "Berlin")}}
+    assert not result.sheets["Static"].has_changes
+    assert result.has_changes
+
+
+def test_diff_by_key_column(make_xlsx):
+    old = make_xlsx("old.xlsx", OLD)
+    new = make_xlsx("new.xlsx", {
+        "Customers": [["id", "name", "city"], ["c3", "Eve", "Oslo"], ["c4", "Dan", "Riga"], ["c1", "Alice", "Paris"], ["c2", "Rob", "Rome"]],
+        "Static": [["a", 1], ["b", 2]],
+        "New": [["y"]],
+    })
+
+    result = diff(old, new, key="A")
+    customers = result.sheets["Customers"]
+
+    assert customers.added == ["c4"]
+    assert customers.removed == []
+    assert customers.changed == {"c2": {"B": ("Bob", "Rob")}}
+    assert result.added_sheets == ["New"]
+    assert result.removed_sheets == ["Gone"]
+
+
+def test_diff_key_is_case_insensitive(make_xlsx):
+    old = make_xlsx("old.xlsx", OLD)
+    new = make_xlsx("new.xlsx", {"Customers": [["id", "name", "city"], ["c2", "Rob", "Rome"], ["c1", "Alice", "Paris"], ["c3", "Eve", "Oslo"]]})
+
+    customers = diff(old, new, key="a").sheets["Customers"]
+
+    assert customers.changed == {"c2": {"B": ("Bob", "Rob")}}
+    assert customers.duplicates == []
+
+
+@pytest.mark.parametrize("key", ["", "1", "A1", "city name"])
+def test_diff_rejects_invalid_key(make_xlsx, key):
+    old = make_xlsx("old.xlsx", OLD)
+
+    with pytest.raises(ValueError, match="column letter"):
+        diff(old, old, key=key)
+
+
+def test_diff_skips_sheets_with_matching_crc(make_xlsx):
+    old = make_xlsx("old.xlsx", OLD)
+    new = make_xlsx("new.xlsx", OLD)
+
+    result = diff(old, new)
+
+    assert all(sheet.skipped for sheet in result.sheets.values())
+    assert not result.has_changes
+
+
+def test_diff_reports_duplicate_keys(make_xlsx):
+    old = make_xlsx("old.xlsx", {"S": [["k1", "x"], ["k1", "y"], ["k2", "z"]]})
+    new = make_xlsx("new.xlsx", {"S": [["k1", "y"], ["k2", "z"]]})
+
+    sheet = diff(old, new, key="A").sheets["S"]
+
+    assert sheet.duplicates == ["k1"]
+    assert sheet.removed == ["k1"]
+    assert sheet.added == []
+    assert sheet.changed == {}
+    assert sheet.has_changes
+
+
+def test_diff_does_not_pair_rows_with_empty_keys(make_xlsx):
+    old = make_xlsx("old.xlsx", {"S": [[None, "a"], [None, "b"], ["k", "c"]]})
+    new = make_xlsx("new.xlsx", {"S": [[None, "b"], ["k", "c"], [None, "d"]]})
+
+    sheet = diff(old, new, key="A").sheets["S"]
+
+    assert sheet.duplicates == [None]
+    assert sheet.removed == [None]
+    assert sheet.added == [None]
+    assert sheet.changed == {}
+
+
+def test_diff_skips_sheets_whose_referenced_strings_match(make_xlsx):
+    old = make_xlsx("old.xlsx", {"T": [["a", 1], ["b", 2]], "U": [["c"]]})
+    new = make_xlsx("new.xlsx", {"T": [["a", 1], ["b", 2]], "U": [["c"], ["new string"]]})
+
+    result = diff(old, new)
+
+    assert result.sheets["T"].skipped
+    assert not result.sheets["U"].skipped
+    assert result.sheets["U"].added == [2]
+
+
+def test_diff_streams_sheets_whose_referenced_strings_differ(make_xlsx):
+    old = make_xlsx("old.xlsx", {"T": [["a"]]})
+    new = make_xlsx("new.xlsx", {"T": [["b"]]})
+
+    result = diff(old, new)
+
+    assert not result.sheets["T"].skipped
+    assert result.sheets["T"].changed == {1: {"A": ("a", "b")}}
+
+
+def test_diff_without_shared_strings(make_xlsx, tmp_path):
+    paths = []
+    for name, value in (("old.xlsx", 1), ("new.xlsx", 2)):
+        path = make_xlsx(name, {"N": [[value]]})
+        stripped = str(tmp_path / f"stripped-{name}")
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(stripped, "w") as target:
+            for info in source.infolist():
+                if info.filename != "xl/sharedStrings.xml":
+                    target.writestr(info, source.read(info))
+        paths.append(stripped)
+
+    result = diff(*paths)
+
+    assert result.sheets["N"].changed == {1: {"A": ("1", "2")}}
@@ -0,0 +1,57 @@
+import sys
+from datetime import datetime
+from decimal import Decimal
+from xcells.core.cell import Cell, NumberCell, StringCell
+from xcells.core.memory import cell_size, str_size, strings_size, value_size
+from xcells.core.reader import Reader
+from xcells.core.worksheet import Worksheet
+
+
+def test_str_size_matches_getsizeof():
+    for value in ["", "abc", "x" * 1000, "naïve résumé", "привет", "a😀", "日本"]:
+        assert str_size(value) == sys.getsizeof(value)
+
+
+def test_value_size_measures_variable_size_types():
+    for value in [1, 2 ** 100, Decimal("1.5"), Decimal("3.14159265358979323846264338327950288")]:
+        assert value_size(value) == sys.getsizeof(value)
+    assert value_size(1.5) == sys.getsizeof(1.5)
+    assert value_size(datetime(2021, 1, 1)) == sys.getsizeof(datetime(2021, 1, 1))
+
+
+def test_cell_size_does_not_count_shared_strings():
+    cell = StringCell('A', '1', '0')
+    cell.value = "a very long shared string" * 100
+    assert cell_size(cell) == cell_size(StringCell('A', '1', '0'))
+
+
+def test_worksheet_memory_usage_breakdown():
+    sheet = Worksheet("1", "Sheet1")
+    sheet.cells = [[Cell('A', '1', 'x'), NumberCell('B', '1', '1.5')],
+                   [Cell('A', '2', 'y'), NumberCell('B', '2', '2.5')]]
+
+    report = sheet.memory_usage()
+    shallow = sheet.memory_usage(deep=False)
+
+    assert set(report["by_column"]) == {"A", "B"}
+    assert set(report["by_type"]) == {"Cell", "NumberCell"}
+    assert report["total"] == report["rows"] + sum(report["by_column"].values())
+    assert report["total"] == report["rows"] + sum(report["by_type"].values())
+    assert shallow["total"] < report["total"]
+
+
+def test_workbook_memory_usage(make_xlsx):
+    path = make_xlsx("book.xlsx", {
+        "Names": [["Alice", 1], ["Bob", 2]],
+        "Codes": [["z"]],
+    })
+    workbook = Reader().read(path)
+
+    report = workbook.memory_usage(deep=True)
+
+    assert set(report["sheets"]) == {"Names", "Codes"}
+    assert report["shared_strings"] == strings_size(workbook._shared_strings)
+    assert report["by_type"]["StringCell"] == sum(
+        sheet["by_type"]["StringCell"] for sheet in report["sheets"].values())
+    assert report["total"] == report["shared_strings"] + sum(
+        sheet["total"] for sheet in report["sheets"].values())
@@ -0,0 +1,88 @@
+import time
+import zipfile
+from unittest.mock import patch
+import pytest
+from xcells.core.pipeline import iter_member_chunks, parse_member
+from xcells.core.reader import Reader
+
+
+SHEETS = {
+    "First": [[i, f"name{i}"] for i in range(500)],
+    "Second": [["code"], ["X1"], [3.5]],
+}
+
+
+def _values(workbook):
+    return [[[cell.value for cell in row] for row in sheet.cells]
+            for sheet in workbook.worksheets]
+
+
+def test_iter_member_chunks_yields_whole_member(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    with zipfile.ZipFile(path) as zipf:
+        expected = zipf.read("xl/worksheets/sheet1.xml")
+        chunks = list(iter_member_chunks(zipf, "xl/worksheets/sheet1.xml", chunk_size=1024, depth=2))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == expected
+
+
+def test_iter_member_chunks_can_be_abandoned(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    with zipfile.ZipFile(path) as zipf:
+        chunks = iter_member_chunks(zipf, "xl/worksheets/sheet1.xml", chunk_size=64, depth=1)
+        assert next(chunks)
+        chunks.close()
+
+
+def test_iter_member_chunks_raises_producer_errors(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    with zipfile.ZipFile(path) as zipf:
+        with pytest.raises(KeyError):
+            list(iter_member_chunks(zipf, "xl/missing.xml"))
+
+
+def test_parse_member(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    with zipfile.ZipFile(path) as zipf:
+        root = parse_member(zipf, "xl/workbook.xml", chunk_size=16)
+    assert root.tag.endswith("workbook")
+
+
+def test_read_pipelined_matches_sequential_read(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    reader = Reader()
+
+    sequential = reader.read(path)
+    pipelined = reader.read(path, pipelined=True)
+
+    assert [sheet.name for sheet in pipelined.worksheets] == ["First", "Second"]
+    assert _values(pipelined) == _values(sequential)
+    assert pipelined._shared_strings == sequential._shared_strings
+
+
+def test_read_pipelined_bounds_sheets_in_flight(make_xlsx):
+    path = make_xlsx("book.xlsx", {f"S{i}": [[i, f"v{i}"]] for i in range(6)})
+    reader = Reader()
+    started = []
+    outstanding = []
+    parse_worksheet = reader._parse_worksheet
+
+    def tracked_parse_member(zipf, name, *args):
+        if name.startswith("xl/worksheets/"):
+            started.append(name)
+        return parse_member(zipf, name, *args)
+
+    def tracked_parse_worksheet(xml_data):
+        # Give every submitted parse the time to start before measuring.
+        time.sleep(0.05)
+        outstanding.append(len(started) - len(outstanding))
+        return parse_worksheet(xml_data)
+
+    with patch("xcells.core.reader.parse_member", tracked_parse_member), \
+            patch.object(reader, "_parse_worksheet", tracked_parse_worksheet):
+        workbook = reader.read(path, pipelined=True)
+
+    assert len(workbook.worksheets) == 6
+    assert len(outstanding) == 6
+    assert max(outstanding) <= Reader._sheets_in_flight + 1
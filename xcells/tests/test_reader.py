@@ -5,7 +5,7 @@ from lxml import etree
 from xcells.core.reader import Reader
 from xcells.core.workbook import Workbook
 from xcells.core.worksheet import Worksheet
-from xcells.core.cell import Cell
+from xcells.core.cell import Cell, CellFabric
 
 
 @pytest.fixture
@@ -90,3 +90,23 @@ def test_extract_shared_strings(reader):
     assert len(shared_strings) == 2
     assert shared_strings[0] == "String1"
     assert shared_strings[1] == "String2"
+
+
+def test_parse_worksheet_splits_cell_references(reader):
+    CellFabric(["0"])
+    xml_data = b"""
+    <worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+        <sheetData>
+            <row r="10">
+                <c r="A10" s="0"><v>1</v></c>
+                <c r="AB10" s="0"><v>2</v></c>
+            </row>
+            <row r="12">
+                <c r="AB12" s="0"><v>3</v></c>
+            </row>
+        </sheetData>
+    </worksheet>
+    """
+    rows = reader._parse_worksheet(xml_data)
+    assert [(cell.col, cell.row) for row in rows for cell in row] == \
+        [("A", "10"), ("AB", "10"), ("AB", "12")]
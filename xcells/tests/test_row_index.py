@@ -0,0 +1,133 @@
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+from xcells.core.reader import Reader
+from xcells.core.row_index import RowIndex
+from xcells.core.cell import NumberCell, PercentCell
+
+
+ROWS = [[i, f"name{i}"] for i in range(250)]
+
+
+def _values(rows):
+    return [[cell.value for cell in row] for row in rows]
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+def test_read_window_matches_full_parse(make_xlsx, compression):
+    path = make_xlsx("big.xlsx", {"Data": ROWS}, compression=compression)
+    expected = Reader().read(path).worksheets[0].cells
+
+    index = RowIndex.build(path, "xl/worksheets/sheet1.xml", every=7, snapshot_bytes=512)
+    assert index.row_count == len(ROWS)
+
+    reader = Reader()
+    for start, stop in [(0, 10), (6, 7), (7, 8), (100, 200), (240, 260), (249, 250)]:
+        rows = reader._parse_worksheet(index.read_window(start, stop))
+        assert [[cell.raw_value for cell in row] for row in rows] == \
+            [[cell.raw_value for cell in row] for row in expected[start:stop]]
+
+
+def test_read_with_row_index_pages_rows(make_xlsx):
+    path = make_xlsx("big.xlsx", {"Data": ROWS, "Other": [["x"]]})
+
+    workbook = Reader().read(path, row_index=True)
+    sheet = workbook.worksheets[0]
+
+    assert sheet.cells == []
+    assert sheet.row_count == len(ROWS)
+    assert _values(sheet.rows(200, 203)) == [[200.0, "name200"], [201.0, "name201"], [202.0, "name202"]]
+    assert _values(sheet.rows(248)) == [[248.0, "name248"], [249.0, "name249"]]
+    assert sheet.rows(300, 400) == []
+    assert _values(workbook.worksheets[1].rows()) == [["x"]]
+    assert os.path.exists(RowIndex.sidecar_path(path, "1"))
+
+
+def test_sidecar_is_reused_and_invalidated(make_xlsx):
+    path = make_xlsx("big.xlsx", {"Data": ROWS})
+    index = RowIndex.build(path, "xl/worksheets/sheet1.xml", every=10)
+    sidecar = RowIndex.sidecar_path(path, "1")
+    index.save(sidecar)
+
+    loaded = RowIndex.load(sidecar, path)
+    assert loaded.row_count == len(ROWS)
+    assert loaded.read_window(120, 125) == index.read_window(120, 125)
+
+    make_xlsx("big.xlsx", {"Data": ROWS[:5]})
+    assert RowIndex.load(sidecar, path) is None
+
+
+def test_worksheet_rows_without_index(make_xlsx):
+    path = make_xlsx("small.xlsx", {"Data": ROWS[:3]})
+    sheet = Reader().read(path).worksheets[0]
+    assert sheet.row_count == 3
+    assert sheet.rows(1, 2) == sheet.cells[1:2]
+
+
+def test_concurrent_reads_share_snapshots(make_xlsx):
+    path = make_xlsx("big.xlsx", {"Data": [[i, f"name{i}"] for i in range(5000)]})
+    index = RowIndex.build(path, "xl/worksheets/sheet1.xml", every=50, snapshot_bytes=4096)
+    index._chunk_size = 512
+    windows = [(start, start + 20) for start in range(0, 5000, 170)] * 4
+    expected = {window: index.read_window(*window) for window in set(windows)}
+    index._snapshots = []
+    results = {}
+
+    def read(window):
+        results.setdefault(window, []).append(index.read_window(*window))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(read, windows))
+
+    assert all(data == expected[window]
+               for window, datas in results.items() for data in datas)
+    assert len(index._snapshots) > 10
+    offsets = [snapshot[0] for snapshot in index._snapshots]
+    assert offsets == sorted(set(offsets))
+
+
+def test_concurrent_paging_keeps_workbook_styles(make_xlsx):
+    rows = [[i] for i in range(300)]
+    numbers = Reader().read(make_xlsx("numbers.xlsx", {"Data": rows}), row_index=True)
+    percents = Reader().read(
+        make_xlsx("percents.xlsx", {"Data": rows}, number_format="10"), row_index=True)
+
+    def page(args):
+        workbook, start = args
+        return {type(cell) for row in workbook.worksheets[0].rows(start, start + 10) for cell in row}
+
+    jobs = [(workbook, start) for start in range(0, 300, 10) for workbook in (numbers, percents)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(page, jobs))
+
+    for (workbook, _), types in zip(jobs, results):
+        assert types == ({NumberCell} if workbook is numbers else {PercentCell})
+
+
+def test_paging_does_not_wait_for_other_index_builds(make_xlsx):
+    workbook = Reader().read(make_xlsx("paged.xlsx", {"Data": ROWS}), row_index=True)
+    other = make_xlsx("other.xlsx", {"Data": ROWS})
+    building = threading.Event()
+    release = threading.Event()
+    build = RowIndex.build
+
+    def blocked_build(*args, **kwargs):
+        building.set()
+        release.wait(5)
+        return build(*args, **kwargs)
+
+    with patch.object(RowIndex, "build", side_effect=blocked_build):
+        thread = threading.Thread(target=Reader().read, args=(other,), kwargs={"row_index": True})
+        thread.start()
+        assert building.wait(5)
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                rows = executor.submit(workbook.worksheets[0].rows, 10, 12).result(timeout=2)
+        finally:
+            release.set()
+            thread.join()
+
+    assert _values(rows) == [[10.0, "name10"], [11.0, "name11"]]
@@ -0,0 +1,91 @@
+import pytest
+from xcells.core.reader import Reader
+from xcells.core.text_index import TextIndex
+from xcells.core.worksheet import Worksheet
+from xcells.core.cell import StringCell
+
+
+SHEETS = {
+    "Customers": [["id", "name"], ["C-1001", "Alice Smith"], ["C-1002", "Bob Stone"]],
+    "Orders": [["customer"], ["C-1002"], ["C-1001"], ["Alice Smith"]] + [["filler"]] * 8 + [["alice"]],
+}
+
+
+def test_find_tokens_and_exact_values(make_xlsx):
+    workbook = Reader().read(make_xlsx("book.xlsx", SHEETS))
+
+    assert workbook.find("c-1002") == [("Customers", "3", "A"), ("Orders", "2", "A")]
+    assert workbook.find("smith ALICE") == [("Customers", "2", "B"), ("Orders", "4", "A")]
+    assert workbook.find("Alice", exact=True) == [("Orders", "13", "A")]
+    assert workbook.find("nobody") == []
+    assert workbook.find("  ") == []
+
+
+def test_find_general_formatted_strings(make_xlsx):
+    workbook = Reader().read(make_xlsx("book.xlsx", SHEETS, string_style="0"))
+
+    assert workbook.find("alice") == [("Customers", "2", "B"), ("Orders", "4", "A"), ("Orders", "13", "A")]
+    assert workbook.find_prefix("bo") == [("Customers", "3", "B")]
+
+
+def test_find_in_sheets_read_with_row_index(make_xlsx):
+    workbook = Reader().read(make_xlsx("book.xlsx", SHEETS, string_style="0"), row_index=True)
+
+    assert workbook.worksheets[0].cells == []
+    assert workbook.find("c-1002") == [("Customers", "3", "A"), ("Orders", "2", "A")]
+
+
+def test_find_prefix(make_xlsx):
+    workbook = Reader().read(make_xlsx("book.xlsx", SHEETS))
+
+    assert workbook.find_prefix("c-100") == [
+        ("Customers", "2", "A"), ("Orders", "3", "A"),
+        ("Customers", "3", "A"), ("Orders", "2", "A")]
+    assert workbook.find_prefix("st") == [("Customers", "3", "B")]
+    assert workbook.find_prefix("") == []
+
+
+def test_save_and_load(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    workbook = Reader().read(path)
+    index = workbook.build_text_index()
+    index.save(TextIndex.sidecar_path(path), path)
+
+    loaded = TextIndex.load(TextIndex.sidecar_path(path), path)
+    reopened = Reader().read(path)
+    reopened.attach_text_index(loaded)
+
+    assert reopened.text_index is loaded
+    assert reopened.find("bob") == index.find("bob") == [("Customers", "3", "B")]
+    assert reopened.find_prefix("ali") == index.find_prefix("ali")
+
+
+def test_load_rejects_stale_index(make_xlsx):
+    path = make_xlsx("book.xlsx", SHEETS)
+    Reader().read(path).build_text_index().save(TextIndex.sidecar_path(path), path)
+
+    make_xlsx("book.xlsx", {"Customers": [["id"], ["C-9999"]]})
+
+    assert TextIndex.load(TextIndex.sidecar_path(path), path) is None
+    assert TextIndex.load(str(path) + ".missing", path) is None
+
+
+def test_attach_rejects_index_of_another_workbook(make_xlsx):
+    index = Reader().read(make_xlsx("book.xlsx", SHEETS)).build_text_index()
+    other = Reader().read(make_xlsx("other.xlsx", {"S": [["unrelated"]]}))
+
+    with pytest.raises(ValueError, match="does not match"):
+        other.attach_text_index(index)
+
+
+def test_add_worksheet_resets_text_index(make_xlsx):
+    workbook = Reader().read(make_xlsx("book.xlsx", SHEETS))
+    assert workbook.find("extra") == []
+
+    sheet = Worksheet("3", "Extra")
+    cell = StringCell("A", "1", str(len(workbook._shared_strings)))
+    workbook._shared_strings.append("extra")
+    sheet.cells = [[cell]]
+    workbook.add_worksheet(sheet)
+
+    assert workbook.find("extra") == [("Extra", "1", "A")]